@@ -1,122 +1,304 @@
 import os
 import subprocess
 import logging
-import platform
-import urllib.request
+import re
+import shutil
+import socket
 import getpass
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.log_config import configure_logging
+
+# Skip the registry audit/funding round-trips and reuse cached tarballs
+NPM_INSTALL_FLAGS = ["--prefer-offline", "--no-audit", "--no-fund", "--loglevel=error"]
+
+# Per-package-manager install flags that resolve from the machine-wide package
+# cache/store (~/.npm, the pnpm store, the yarn cache) before the registry
+INSTALL_FLAGS = {
+    "npm": NPM_INSTALL_FLAGS,
+    "pnpm": ["--prefer-offline"],
+    "yarn": ["--prefer-offline"],
+}
+
+NODESOURCE_SETUP_URL = "https://deb.nodesource.com/setup_20.x"
+
+# Child processes are spawned with close_fds=False and a PATH-resolved
+# executable (see _resolve) so CPython can take the posix_spawn fast path;
+# before 3.13 it also needs cwd=None. Callers must not hold sensitive
+# descriptors open while scaffolding, since they are inherited by every
+# spawned tool.
+
+# Dependency messages propagate to the application's root log handler
+_LOG = logging.getLogger("visual_scaffolder.dependencies")
+
+
+def _resolve(command):
+    """Swap a bare executable name for its PATH location.
+
+    CPython only uses posix_spawn for an executable given with a directory;
+    a name that is not found is left as-is so the call still raises
+    FileNotFoundError.
+    """
+    path = shutil.which(command[0])
+    return [path, *command[1:]] if path else command
+
+
+def _is_root():
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
+
+def _elevated(command):
+    # Root needs no sudo wrapper (and containers often lack sudo entirely)
+    return command if _is_root() else ["sudo"] + command
 
 
 class DependencyManager:
     def __init__(self, log_file):
         self.log_file = log_file
-        logging.basicConfig(
-            filename=self.log_file,
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
+        # Like the basicConfig call this replaces, a no-op once the
+        # application has configured logging
+        configure_logging(log_file)
+        self.log = _LOG
+        # Successful check_node/check_vue_cli/check_angular_cli results. Failures
+        # are not cached, so a tool installed mid-session is picked up.
+        self._cache = {}
+        self._cache_lock = threading.RLock()
+
+    def _cached(self, tool, probe):
+        with self._cache_lock:
+            if tool in self._cache:
+                return self._cache[tool]
+        # Probe outside the lock so independent checks can run concurrently
+        result = probe()
+        if not result[0]:
+            return result
+        with self._cache_lock:
+            return self._cache.setdefault(tool, result)
+
+    def _mark_installed(self, tool):
+        with self._cache_lock:
+            self._cache[tool] = (True, "")
+
+    def invalidate(self, tool=None):
+        with self._cache_lock:
+            if tool is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(tool, None)
+
+    def _run_checks(self, *checks):
+        # Version probes are independent subprocesses, so overlap their startup
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(check) for check in checks]
+            return [future.result() for future in futures]
 
     def check_internet(self):
         try:
-            urllib.request.urlopen("https://deb.nodesource.com", timeout=5)
-            logging.info("Internet connection verified")
+            # A bare TCP connect is enough to prove connectivity; no TLS handshake
+            socket.create_connection(("deb.nodesource.com", 443), timeout=2).close()
+            self.log.info("Internet connection verified")
             return True, ""
         except Exception as e:
-            logging.error(f"No internet connection: {str(e)}")
+            self.log.error("No internet connection: %s", e)
             return False, f"No internet connection. Please check your network: {str(e)}"
 
     def check_sudo(self):
+        if _is_root():
+            self.log.info("Already running as root")
+            return True, ""
         try:
             subprocess.run(
-                ["sudo", "-n", "true"], capture_output=True, text=True, check=True
+                _resolve(["sudo", "-n", "true"]),
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
-            logging.info("Sudo access verified (non-interactive)")
+            self.log.info("Sudo access verified (non-interactive)")
             return True, ""
         except subprocess.CalledProcessError:
-            logging.info("Sudo requires password or is not available")
+            self.log.info("Sudo requires password or is not available")
             return False, "Sudo requires password"
         except FileNotFoundError:
-            logging.error("Sudo not installed")
+            self.log.error("Sudo not installed")
             return (
                 False,
                 "Sudo is not installed. Run: sudo apt update && sudo apt install -y sudo",
             )
 
-    def run_with_sudo(self, command, error_message):
+    def run_with_sudo(self, command, error_message, timeout=900):
         try:
+            if _is_root():
+                result = subprocess.run(
+                    _resolve(command),
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    close_fds=False,
+                )
+                if result.returncode != 0:
+                    error = f"{error_message}: {result.stderr or result.stdout or 'Command failed without output'}"
+                    self.log.error(error)
+                    return False, error
+                return True, ""
             password = getpass.getpass("Enter your sudo password: ")
             full_command = ["sudo", "-S"] + command
             process = subprocess.Popen(
-                full_command,
+                _resolve(full_command),
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                bufsize=-1,
                 text=True,
+                close_fds=False,
             )
-            stdout, stderr = process.communicate(input=password + "\n")
+            try:
+                stdout, stderr = process.communicate(
+                    input=password + "\n", timeout=timeout
+                )
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                error = f"{error_message}: timed out after {timeout} seconds"
+                self.log.error(error)
+                return False, error
             if process.returncode != 0:
                 error = f"{error_message}: {stderr or stdout or 'Command failed without output'}"
-                logging.error(error)
+                self.log.error(error)
                 return False, error
             return True, ""
         except Exception as e:
             error = f"Unexpected error running sudo command: {str(e)}"
-            logging.error(error)
+            self.log.error(error)
             return False, error
 
     def check_node(self):
+        return self._cached("node", self._probe_node)
+
+    def _node_version_from_headers(self, node_path):
+        # Official and NodeSource builds install node_version.h under
+        # <prefix>/include/node, which lets us skip spawning Node at all. The
+        # header is only trusted for a real <prefix>/bin/node binary; launchers
+        # such as snap resolve elsewhere and fall back to node --version.
+        binary = os.path.realpath(node_path)
+        bin_dir, name = os.path.split(binary)
+        if name not in ("node", "nodejs") or os.path.basename(bin_dir) != "bin":
+            return None
+        prefix = os.path.dirname(bin_dir)
+        header = os.path.join(prefix, "include", "node", "node_version.h")
         try:
-            result = subprocess.run(
-                ["node", "--version"], capture_output=True, text=True, check=True
+            with open(header, "r") as f:
+                content = f.read()
+        except OSError:
+            return None
+        parts = []
+        for part in ("MAJOR", "MINOR", "PATCH"):
+            match = re.search(rf"#define NODE_{part}_VERSION (\d+)", content)
+            if not match:
+                return None
+            parts.append(match.group(1))
+        return "v" + ".".join(parts)
+
+    def _probe_node(self):
+        node_path = shutil.which("node")
+        if node_path is None:
+            self.log.info("Node.js not installed or not found in PATH")
+            return (
+                False,
+                "Node.js is not installed. Run: sudo apt update && sudo apt install -y curl && curl -fsSL https://deb.nodesource.com/setup_20.x | sudo -E bash - && sudo apt install -y nodejs",
             )
-            node_version = result.stdout.strip()
-            logging.info(f"Node.js found: {node_version}")
+        try:
+            node_version = self._node_version_from_headers(node_path)
+            if node_version is None:
+                result = subprocess.run(
+                    [node_path, "--version"],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    close_fds=False,
+                )
+                node_version = result.stdout.strip()
+            self.log.info("Node.js found: %s", node_version)
             major_version = int(node_version.split(".")[0].lstrip("v"))
             minor_version = int(node_version.split(".")[1])
             if major_version > 20 or (major_version == 20 and minor_version >= 11):
                 return True, ""
             else:
-                logging.warning(
-                    f"Node.js version {node_version} is not supported (required: >=20.11.1)"
+                self.log.warning(
+                    "Node.js version %s is not supported (required: >=20.11.1)",
+                    node_version,
                 )
                 return (
                     False,
                     f"Node.js version {node_version} is not supported. Run: sudo apt update && sudo apt install -y curl && curl -fsSL https://deb.nodesource.com/setup_20.x | sudo -E bash - && sudo apt install -y nodejs",
                 )
         except (subprocess.CalledProcessError, FileNotFoundError):
-            logging.info("Node.js not installed or not found in PATH")
+            self.log.info("Node.js not installed or not found in PATH")
             return (
                 False,
                 "Node.js is not installed. Run: sudo apt update && sudo apt install -y curl && curl -fsSL https://deb.nodesource.com/setup_20.x | sudo -E bash - && sudo apt install -y nodejs",
             )
 
     def check_vue_cli(self):
+        return self._cached("vue", self._probe_vue_cli)
+
+    def _probe_vue_cli(self):
         try:
             result = subprocess.run(
-                ["vue", "--version"], capture_output=True, text=True, check=True
+                _resolve(["vue", "--version"]),
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
             vue_version = result.stdout.strip()
-            logging.info(f"Vue CLI found: {vue_version}")
+            self.log.info("Vue CLI found: %s", vue_version)
             return True, ""
         except (subprocess.CalledProcessError, FileNotFoundError):
-            logging.info("Vue CLI not installed or not found in PATH")
+            self.log.info("Vue CLI not installed or not found in PATH")
             return False, "Vue CLI is not installed. Run: npm install -g @vue/cli"
 
     def check_angular_cli(self):
+        return self._cached("angular", self._probe_angular_cli)
+
+    def _probe_angular_cli(self):
         try:
             result = subprocess.run(
-                ["ng", "--version"], capture_output=True, text=True, check=True
+                _resolve(["ng", "--version"]),
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
             angular_version = result.stdout.strip()
-            logging.info(f"Angular CLI found: {angular_version}")
+            self.log.info("Angular CLI found: %s", angular_version)
             return True, ""
         except (subprocess.CalledProcessError, FileNotFoundError):
-            logging.info("Angular CLI not installed or not found in PATH")
+            self.log.info("Angular CLI not installed or not found in PATH")
             return (
                 False,
                 "Angular CLI is not installed. Run: npm install -g @angular/cli",
             )
 
-    def install_node(self):
+    def _download(self, url, path):
+        # Deferred import: urllib is only needed when Node.js must be installed
+        import urllib.request
+
+        # Stream in-process rather than spawning curl; curl is only a fallback
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response, open(
+                path, "wb"
+            ) as f:
+                shutil.copyfileobj(response, f, length=65536)
+        except OSError as e:
+            self.log.warning("Download of %s failed, retrying with curl: %s", url, e)
+            subprocess.run(
+                _resolve(["curl", "-fsSL", url, "-o", path]),
+                check=True,
+                close_fds=False,
+            )
+
+    def install_node(self, strict=False):
         internet_success, internet_error = self.check_internet()
         if not internet_success:
             return False, internet_error
@@ -126,142 +308,122 @@ class DependencyManager:
             return False, sudo_error
 
         try:
-            logging.info("Downloading Node.js 20.11.1 setup script")
+            self.log.info("Downloading Node.js 20.11.1 setup script")
             script_path = "/tmp/nodesource_setup.sh"
-            subprocess.run(
-                [
-                    "curl",
-                    "-fsSL",
-                    "https://deb.nodesource.com/setup_20.x",
-                    "-o",
-                    script_path,
-                ],
-                check=True,
-            )
-            logging.info("Running Node.js setup script")
+            self._download(NODESOURCE_SETUP_URL, script_path)
+            self.log.info("Running Node.js setup script")
             sudo_success, sudo_error = self.run_with_sudo(
                 ["bash", script_path], "Failed to run Node.js setup script"
             )
             if not sudo_success:
                 return False, sudo_error
-            logging.info("Installing Node.js")
+            self.log.info("Installing Node.js")
             sudo_success, sudo_error = self.run_with_sudo(
                 ["apt", "install", "-y", "nodejs"], "Failed to install Node.js"
             )
             if not sudo_success:
                 return False, sudo_error
+            if not strict and shutil.which("node"):
+                self.log.info("Node.js installed")
+                self._mark_installed("node")
+                return True, ""
             result = subprocess.run(
-                ["node", "--version"], capture_output=True, text=True, check=True
+                _resolve(["node", "--version"]),
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
-            logging.info(f"Node.js installed: {result.stdout.strip()}")
+            self.log.info("Node.js installed: %s", result.stdout.strip())
+            self._mark_installed("node")
             return True, ""
         except subprocess.CalledProcessError as e:
             error = f"Failed to install Node.js: {e.stderr or e.stdout or 'Command failed without output'}"
-            logging.error(error)
+            self.log.error(error)
             return False, error
         except Exception as e:
             error = f"Unexpected error installing Node.js: {str(e)}"
-            logging.error(error)
+            self.log.error(error)
             return False, error
         finally:
             if os.path.exists(script_path):
                 os.remove(script_path)
-                logging.info(f"Cleaned up {script_path}")
+                self.log.info("Cleaned up %s", script_path)
 
-    def install_vue_cli(self):
+    def _install_npm_global(self, package, binary, label, cache_key, strict=False):
+        command = ["npm", "install", "-g", *NPM_INSTALL_FLAGS, package]
         success, error = self.check_sudo()
         if not success:
-            success, error = self.run_with_sudo(
-                ["npm", "install", "-g", "@vue/cli"], "Failed to install Vue CLI"
-            )
+            success, error = self.run_with_sudo(command, f"Failed to install {label}")
             if not success:
                 return False, error
         else:
             try:
-                logging.info("Installing Vue CLI globally")
+                self.log.info("Installing %s globally", label)
                 subprocess.run(
-                    ["sudo", "npm", "install", "-g", "@vue/cli"],
+                    _resolve(_elevated(command)),
                     check=True,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    bufsize=-1,
                     text=True,
+                    close_fds=False,
                 )
             except subprocess.CalledProcessError as e:
-                error = f"Failed to install Vue CLI: {e.stderr or e.stdout or 'Command failed without output'}"
-                logging.error(error)
+                error = f"Failed to install {label}: {e.stderr or e.stdout or 'Command failed without output'}"
+                self.log.error(error)
                 return False, error
             except Exception as e:
-                error = f"Unexpected error installing Vue CLI: {str(e)}"
-                logging.error(error)
+                error = f"Unexpected error installing {label}: {str(e)}"
+                self.log.error(error)
                 return False, error
 
-        try:
-            result = subprocess.run(
-                ["vue", "--version"], capture_output=True, text=True, check=True
-            )
-            logging.info(f"Vue CLI installed: {result.stdout.strip()}")
+        # The install exited cleanly; only re-run the binary when asked to
+        if not strict and shutil.which(binary):
+            self.log.info("%s installed", label)
+            self._mark_installed(cache_key)
             return True, ""
-        except subprocess.CalledProcessError as e:
-            error = f"Failed to verify Vue CLI installation: {e.stderr or e.stdout or 'Command failed without output'}"
-            logging.error(error)
-            return False, error
-        except Exception as e:
-            error = f"Unexpected error verifying Vue CLI installation: {str(e)}"
-            logging.error(error)
-            return False, error
-
-    def install_angular_cli(self):
-        success, error = self.check_sudo()
-        if not success:
-            success, error = self.run_with_sudo(
-                ["npm", "install", "-g", "@angular/cli"],
-                "Failed to install Angular CLI",
-            )
-            if not success:
-                return False, error
-        else:
-            try:
-                logging.info("Installing Angular CLI globally")
-                subprocess.run(
-                    ["sudo", "npm", "install", "-g", "@angular/cli"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-            except subprocess.CalledProcessError as e:
-                error = f"Failed to install Angular CLI: {e.stderr or e.stdout or 'Command failed without output'}"
-                logging.error(error)
-                return False, error
-            except Exception as e:
-                error = f"Unexpected error installing Angular CLI: {str(e)}"
-                logging.error(error)
-                return False, error
 
         try:
             result = subprocess.run(
-                ["ng", "--version"], capture_output=True, text=True, check=True
+                _resolve([binary, "--version"]),
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
-            logging.info(f"Angular CLI installed: {result.stdout.strip()}")
+            self.log.info("%s installed: %s", label, result.stdout.strip())
+            self._mark_installed(cache_key)
             return True, ""
         except subprocess.CalledProcessError as e:
-            error = f"Failed to verify Angular CLI installation: {e.stderr or e.stdout or 'Command failed without output'}"
-            logging.error(error)
+            error = f"Failed to verify {label} installation: {e.stderr or e.stdout or 'Command failed without output'}"
+            self.log.error(error)
             return False, error
         except Exception as e:
-            error = f"Unexpected error verifying Angular CLI installation: {str(e)}"
-            logging.error(error)
+            error = f"Unexpected error verifying {label} installation: {str(e)}"
+            self.log.error(error)
             return False, error
 
+    def install_vue_cli(self, strict=False):
+        return self._install_npm_global("@vue/cli", "vue", "Vue CLI", "vue", strict)
+
+    def install_angular_cli(self, strict=False):
+        return self._install_npm_global(
+            "@angular/cli", "ng", "Angular CLI", "angular", strict
+        )
+
     def ensure_dependencies(self):
-        node_success, node_error = self.check_node()
+        (node_success, node_error), (vue_success, vue_error) = self._run_checks(
+            self.check_node, self.check_vue_cli
+        )
         if not node_success:
-            logging.info("Attempting to install Node.js")
+            self.log.info("Attempting to install Node.js")
             node_success, node_error = self.install_node()
             if not node_success:
                 return False, node_error
 
-        vue_success, vue_error = self.check_vue_cli()
         if not vue_success:
-            logging.info("Attempting to install Vue CLI")
+            self.log.info("Attempting to install Vue CLI")
             vue_success, vue_error = self.install_vue_cli()
             if not vue_success:
                 return False, vue_error
@@ -269,18 +431,37 @@ class DependencyManager:
         return True, ""
 
     def ensure_angular_dependencies(self):
-        node_success, node_error = self.check_node()
+        (node_success, node_error), (angular_success, angular_error) = self._run_checks(
+            self.check_node, self.check_angular_cli
+        )
         if not node_success:
-            logging.info("Attempting to install Node.js")
+            self.log.info("Attempting to install Node.js")
             node_success, node_error = self.install_node()
             if not node_success:
                 return False, node_error
 
-        angular_success, angular_error = self.check_angular_cli()
         if not angular_success:
-            logging.info("Attempting to install Angular CLI")
+            self.log.info("Attempting to install Angular CLI")
             angular_success, angular_error = self.install_angular_cli()
             if not angular_success:
                 return False, angular_error
 
         return True, ""
+
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_dependency_manager(log_file):
+    """Return the process-wide DependencyManager.
+
+    Tool availability does not depend on the project being scaffolded, so one
+    manager (and its check cache) is shared by every scaffold in the session.
+    log_file is only used if logging has not been configured yet.
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = DependencyManager(log_file)
+        return _shared_manager
@@ -2,71 +2,128 @@ import os
 import subprocess
 import logging
 import json
+import shlex
 import shutil
-from dependencies import DependencyManager
-from utils.scaffold_tracker import write_scaffold_metadata
-from utils.git_manager import init_git_repo
+import threading
+import time
+from collections import deque
+from dependencies import INSTALL_FLAGS, get_dependency_manager
+from utils.file_writer import dump_json, write_files, write_text
+from utils.templates import STYLELINT_RC, TAILWIND_DIRECTIVES
+
+# Constant config files, serialized once at import time
+TAILWIND_CONFIG_JS = "module.exports = " + dump_json(
+    {
+        "content": ["./src/**/*.{html,ts}"],
+        "theme": {"extend": {}},
+        "plugins": [],
+    }
+)
+POSTCSS_CONFIG_JS = "module.exports = " + dump_json(
+    {
+        "plugins": {
+            "postcss-import": {},
+            "@tailwindcss/postcss": {},
+            "autoprefixer": {},
+        }
+    }
+)
+JEST_CONFIG_JS = "module.exports = " + dump_json(
+    {
+        "preset": "jest-preset-angular",
+        "setupFilesAfterEnv": ["<rootDir>/src/setup-jest.ts"],
+        "testPathIgnorePatterns": ["/node_modules/"],
+        "globals": {"ts-jest": {"tsconfig": "<rootDir>/tsconfig.spec.json"}},
+    }
+)
+SETUP_JEST_TS = "import 'jest-preset-angular/setup-jest';\n"
+
+
+def _remove_tree(path):
+    try:
+        shutil.rmtree(path)
+        logging.info("Successfully removed %s", path)
+    except Exception as e:
+        logging.error("Failed to remove old project directory %s: %s", path, e)
 
 
-def create_angular_project(
-    project_path,
-    project_name,
-    use_typescript,
-    use_eslint,
-    eslint_config,
-    custom_eslint_rules,
-    use_tailwind,
-    use_prettier,
-    prettier_config,
-    auto_install,
-    use_routing,
-    package_manager,
-    use_stylelint,
-    env_vars,
-    use_tests=False,
-):
+def create_angular_project(cfg):
+    project_path = cfg.project_path
+    project_name = cfg.project_name
+    use_typescript = cfg.use_typescript
+    use_eslint = cfg.use_eslint
+    eslint_config = cfg.eslint_config
+    custom_eslint_rules = cfg.custom_eslint_rules
+    use_tailwind = cfg.use_tailwind
+    use_prettier = cfg.use_prettier
+    prettier_config = cfg.prettier_config
+    use_routing = cfg.use_routing
+    package_manager = cfg.package_manager
+    use_stylelint = cfg.use_stylelint
+    env_vars = cfg.env_vars
+    use_tests = cfg.use_tests
+
     # Validate package_manager
     valid_package_managers = ["npm", "yarn", "pnpm", "cnpm", "bun"]
     if package_manager not in valid_package_managers:
         logging.warning(
-            f"Invalid package_manager '{package_manager}', defaulting to 'npm'"
+            "Invalid package_manager '%s', defaulting to 'npm'", package_manager
         )
         package_manager = "npm"
 
     # Log input parameters for debugging
     logging.info(
-        f"Input parameters: project_path={project_path}, project_name={project_name}, "
-        f"use_typescript={use_typescript}, use_eslint={use_eslint}, "
-        f"eslint_config={eslint_config}, use_tailwind={use_tailwind}, "
-        f"use_prettier={use_prettier}, use_routing={use_routing}, "
-        f"package_manager={package_manager}, use_stylelint={use_stylelint}, "
-        f"use_tests={use_tests}"
+        "Input parameters: project_path=%s, project_name=%s, "
+        "use_typescript=%s, use_eslint=%s, "
+        "eslint_config=%s, use_tailwind=%s, "
+        "use_prettier=%s, use_routing=%s, "
+        "package_manager=%s, use_stylelint=%s, "
+        "use_tests=%s",
+        project_path,
+        project_name,
+        use_typescript,
+        use_eslint,
+        eslint_config,
+        use_tailwind,
+        use_prettier,
+        use_routing,
+        package_manager,
+        use_stylelint,
+        use_tests,
     )
 
-    # Initialize DependencyManager
+    # Reuse the session-wide DependencyManager and its cached checks
     log_file = os.path.join(project_path, "logs", "scaffold.log")
-    dep_manager = DependencyManager(log_file)
+    dep_manager = get_dependency_manager(log_file)
 
     # Ensure dependencies
-    success, error = dep_manager.ensure_dependencies()
+    success, error = dep_manager.ensure_angular_dependencies()
     if not success:
         return False, error
 
+    cleanup_thread = None
     try:
         project_dir = os.path.join(project_path, project_name)
-        # Remove existing project directory to avoid conflicts
-        if os.path.exists(project_dir):
-            logging.info(f"Removing existing project directory: {project_dir}")
+        # Remove existing project directory to avoid conflicts. The old tree is
+        # renamed out of the way and deleted in the background so ng new does
+        # not wait on thousands of node_modules unlinks. An empty directory
+        # (e.g. one pre-created by ProjectScaffolder) is simply reused.
+        if os.path.isdir(project_dir) and os.listdir(project_dir):
+            logging.info("Removing existing project directory: %s", project_dir)
             try:
-                shutil.rmtree(project_dir, ignore_errors=False)
-                logging.info(f"Successfully removed {project_dir}")
+                trash_dir = f"{project_dir}.trash.{os.getpid()}.{time.time_ns()}"
+                os.rename(project_dir, trash_dir)
+                cleanup_thread = threading.Thread(
+                    target=_remove_tree, args=(trash_dir,)
+                )
+                cleanup_thread.start()
             except Exception as e:
                 logging.error(
-                    f"Failed to remove existing directory {project_dir}: {str(e)}"
+                    "Failed to remove existing directory %s: %s", project_dir, e
                 )
                 return False, f"Failed to remove existing directory: {str(e)}"
         os.makedirs(project_dir, exist_ok=True)
-        logging.info(f"Created project directory: {project_dir}")
+        logging.info("Created project directory: %s", project_dir)
 
         # Construct ng new command
         cmd = [
@@ -76,87 +133,89 @@ def create_angular_project(
             "--style=css",
             f"--routing={str(use_routing).lower()}",
             "--skip-git",
+            # Angular's own dependencies are installed below together with
+            # the optional dev dependencies in a single package manager run
+            "--skip-install",
             "--force",
             f"--package-manager={package_manager}",
         ]
         if not use_typescript:
             cmd.append("--skip-typescript")
-        logging.info(f"Running command: {' '.join(cmd)} in {project_path}")
-        result = subprocess.run(
-            cmd, cwd=project_path, check=True, capture_output=True, text=True
-        )
-        logging.info(f"Angular project created: {result.stdout}")
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("Running command: %s in %s", shlex.join(cmd), project_path)
+        # Stream ng new output into the log as it arrives instead of buffering
+        # it, keeping only the tail for the error message
+        output_tail = deque(maxlen=200)
+        with subprocess.Popen(
+            cmd,
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            close_fds=False,
+        ) as process:
+            for line in process.stdout:
+                logging.info(line.rstrip())
+                output_tail.append(line)
+            returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, cmd, output="".join(output_tail)
+            )
+        logging.info("Angular project created")
 
         # Log project directory contents for debugging
         dir_contents = os.listdir(project_dir)
-        logging.info(f"Project directory contents: {dir_contents}")
+        logging.info("Project directory contents: %s", dir_contents)
         src_dir = os.path.join(project_dir, "src")
         if os.path.exists(src_dir):
             src_contents = os.listdir(src_dir)
-            logging.info(f"src directory contents: {src_contents}")
+            logging.info("src directory contents: %s", src_contents)
         else:
             logging.error("src directory not found")
             return False, "Angular project creation failed: src directory not found"
 
-        # Initialize Git repository
-        init_git_repo(project_dir)
-
-        # Write scaffold metadata
-        config = {
-            "project_name": project_name,
-            "framework": "angular",
-            "use_typescript": use_typescript,
-            "use_eslint": use_eslint,
-            "eslint_config": eslint_config,
-            "custom_eslint_rules": custom_eslint_rules,
-            "use_tailwind": use_tailwind,
-            "use_prettier": use_prettier,
-            "prettier_config": prettier_config,
-            "use_router": use_routing,
-            "package_manager": package_manager,
-            "use_stylelint": use_stylelint,
-            "env_vars": env_vars,
-            "use_tests": use_tests,
-        }
-        write_scaffold_metadata(project_dir, config)
-
         # Update package.json to add lint script
         package_json_path = os.path.join(project_dir, "package.json")
-        with open(package_json_path, "r") as f:
+        # Read and rewrite through a single file handle
+        with open(package_json_path, "r+") as f:
             package_json = json.load(f)
-        package_json["scripts"] = package_json.get("scripts", {})
-        package_json["scripts"]["lint"] = "ng lint --fix"
-        with open(package_json_path, "w") as f:
-            json.dump(package_json, f, indent=2)
-        logging.info(f"Updated {package_json_path} with lint script")
+            package_json["scripts"] = package_json.get("scripts", {})
+            package_json["scripts"]["lint"] = "ng lint --fix"
+            f.seek(0)
+            f.truncate()
+            f.write(dump_json(package_json))
+        logging.info("Updated %s with lint script", package_json_path)
+
+        # Read angular.json once; the Jest and ESLint steps both consult it
+        angular_json_path = os.path.join(project_dir, "angular.json")
+        with open(angular_json_path, "r") as f:
+            angular_json = json.load(f)
+        projects = angular_json.get("projects", {})
+        project_key = next(iter(projects), None)
+
+        # Dev dependencies are installed in a single package manager run, and
+        # small config files are collected and written in one batch
+        dev_deps = []
+        config_writes = []
 
         if use_eslint:
-            logging.info(f"Installing ESLint with config {eslint_config}")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "@angular-eslint/schematics",
-                    f"eslint-config-{eslint_config}",
-                    "eslint",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"ESLint installation: {result.stdout}")
-            # Run ng lint setup
-            result = subprocess.run(
-                ["ng", "lint", "--fix"],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"ESLint setup: {result.stdout}")
-            # Create .eslintrc.json
+            if not isinstance(custom_eslint_rules, dict):
+                logging.error(
+                    "Invalid ESLint configuration: custom rules must be an object"
+                )
+                return (
+                    False,
+                    "Invalid ESLint configuration: Custom ESLint rules must be a valid JSON object",
+                )
+            dev_deps += [
+                "@angular-eslint/schematics",
+                f"eslint-config-{eslint_config}",
+                "eslint",
+            ]
+            # .eslintrc.json is written after the ESLint schematic below,
+            # which generates its own root config
             eslint_config_json = {
                 "env": {"browser": True, "es2021": True},
                 "extends": [
@@ -169,185 +228,131 @@ def create_angular_project(
                 "rules": custom_eslint_rules.get("rules", {}),
             }
             eslint_file = os.path.join(project_dir, ".eslintrc.json")
-            with open(eslint_file, "w") as f:
-                json.dump(eslint_config_json, f, indent=2)
-            logging.info(f"Created {eslint_file} with ESLint configuration")
-            # Run eslint --fix
-            try:
-                result = subprocess.run(
-                    ["npx", "eslint", "src/**/*.{ts,js}", "--fix"],
-                    cwd=project_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                logging.info(f"ESLint auto-fix completed: {result.stdout}")
-            except subprocess.CalledProcessError as e:
-                logging.warning(
-                    f"ESLint auto-fix failed: {e.stderr or e.stdout or 'No additional error details'}"
-                )
 
         if use_tailwind:
-            logging.info("Installing Tailwind CSS with PostCSS plugins")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "tailwindcss",
-                    "@tailwindcss/postcss",
-                    "postcss",
-                    "autoprefixer",
-                    "postcss-import",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Tailwind/PostCSS installation: {result.stdout}")
+            dev_deps += [
+                "tailwindcss",
+                "@tailwindcss/postcss",
+                "postcss",
+                "autoprefixer",
+                "postcss-import",
+            ]
             # Create tailwind.config.js
-            tailwind_config = {
-                "content": ["./src/**/*.{html,ts}"],
-                "theme": {"extend": {}},
-                "plugins": [],
-            }
             tailwind_config_file = os.path.join(project_dir, "tailwind.config.js")
-            with open(tailwind_config_file, "w") as f:
-                f.write(f"module.exports = {json.dumps(tailwind_config, indent=2)}")
-            logging.info(f"Created {tailwind_config_file}")
+            config_writes.append((tailwind_config_file, TAILWIND_CONFIG_JS))
             # Create postcss.config.js
-            postcss_config = {
-                "plugins": {
-                    "postcss-import": {},
-                    "@tailwindcss/postcss": {},
-                    "autoprefixer": {},
-                }
-            }
             postcss_config_file = os.path.join(project_dir, "postcss.config.js")
-            with open(postcss_config_file, "w") as f:
-                f.write(f"module.exports = {json.dumps(postcss_config, indent=2)}")
-            logging.info(f"Created {postcss_config_file}")
+            config_writes.append((postcss_config_file, POSTCSS_CONFIG_JS))
             # Update src/styles.css
             css_file = os.path.join(project_dir, "src", "styles.css")
-            tailwind_directives = """
-@tailwind base;
-@tailwind components;
-@tailwind utilities;
-"""
-            with open(css_file, "w") as f:
-                f.write(tailwind_directives)
-            logging.info(f"Updated {css_file} with Tailwind directives")
+            config_writes.append((css_file, TAILWIND_DIRECTIVES))
 
         if use_prettier:
-            logging.info("Installing Prettier")
-            result = subprocess.run(
-                [package_manager, "install", "--save-dev", "prettier"],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Prettier installation: {result.stdout}")
+            dev_deps.append("prettier")
             # Apply Prettier config
             try:
                 if not isinstance(prettier_config, dict):
                     raise ValueError("Prettier config must be a valid JSON object")
                 prettier_file = os.path.join(project_dir, ".prettierrc")
-                with open(prettier_file, "w") as f:
-                    json.dump(prettier_config, f, indent=2)
-                logging.info(f"Applied Prettier config to {prettier_file}")
+                config_writes.append((prettier_file, dump_json(prettier_config)))
             except ValueError as e:
-                logging.error(f"Invalid Prettier configuration: {str(e)}")
+                logging.error("Invalid Prettier configuration: %s", e)
                 return False, f"Invalid Prettier configuration: {str(e)}"
 
         if use_stylelint:
-            logging.info("Installing Stylelint")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "stylelint",
-                    "stylelint-config-standard",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Stylelint installation: {result.stdout}")
-            stylelint_config = {
-                "extends": "stylelint-config-standard",
-                "rules": {"indentation": 2, "number-leading-zero": "always"},
-            }
+            dev_deps += ["stylelint", "stylelint-config-standard"]
             stylelint_file = os.path.join(project_dir, ".stylelintrc.json")
-            with open(stylelint_file, "w") as f:
-                json.dump(stylelint_config, f, indent=2)
-            logging.info(f"Created {stylelint_file}")
+            config_writes.append((stylelint_file, STYLELINT_RC))
 
         if use_tests:
-            logging.info("Installing Jest for testing")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "jest",
-                    "@angular-builders/jest",
-                    "@types/jest",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Jest installation: {result.stdout}")
+            dev_deps += [
+                "jest",
+                "@angular-builders/jest",
+                "@types/jest",
+                "jest-preset-angular",
+            ]
             # Update angular.json for Jest
-            angular_json_path = os.path.join(project_dir, "angular.json")
-            with open(angular_json_path, "r") as f:
-                angular_json = json.load(f)
-            projects = angular_json.get("projects", {})
-            project_key = next(iter(projects))
             projects[project_key]["architect"]["test"] = {
                 "builder": "@angular-builders/jest:run",
                 "options": {"configPath": "jest.config.js"},
             }
-            with open(angular_json_path, "w") as f:
-                json.dump(angular_json, f, indent=2)
-            logging.info(f"Updated {angular_json_path} with Jest configuration")
+            # The package manager never touches angular.json, so it can go
+            # out with the other config files
+            config_writes.append((angular_json_path, dump_json(angular_json)))
             # Create jest.config.js
-            jest_config = {
-                "preset": "jest-preset-angular",
-                "setupFilesAfterEnv": ["<rootDir>/src/setup-jest.ts"],
-                "testPathIgnorePatterns": ["/node_modules/"],
-                "globals": {"ts-jest": {"tsconfig": "<rootDir>/tsconfig.spec.json"}},
-            }
             jest_config_file = os.path.join(project_dir, "jest.config.js")
-            with open(jest_config_file, "w") as f:
-                f.write(f"module.exports = {json.dumps(jest_config, indent=2)}")
-            logging.info(f"Created {jest_config_file}")
+            config_writes.append((jest_config_file, JEST_CONFIG_JS))
             # Create src/setup-jest.ts
             setup_jest_file = os.path.join(project_dir, "src", "setup-jest.ts")
-            with open(setup_jest_file, "w") as f:
-                f.write("import 'jest-preset-angular/setup-jest';\n")
-            logging.info(f"Created {setup_jest_file}")
-            # Install jest-preset-angular
+            config_writes.append((setup_jest_file, SETUP_JEST_TS))
+
+        # Apply environment variables
+        if env_vars:
+            env_file = os.path.join(project_dir, ".env")
+            config_writes.append((env_file, env_vars))
+
+        # One install resolves the dependencies ng new wrote to package.json
+        # together with the dev dependencies for the selected features
+        install_cmd = [package_manager, "install"]
+        if dev_deps:
+            install_cmd.append("--save-dev")
+        install_cmd += INSTALL_FLAGS.get(package_manager, [])
+        install_cmd += dev_deps
+        logging.info("Installing dependencies with dev dependencies: %s", dev_deps)
+        install_process = subprocess.Popen(
+            install_cmd,
+            cwd=project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False,
+        )
+
+        # Config files don't touch node_modules, so write them while the
+        # install is still running
+        try:
+            write_files(config_writes)
+        except Exception:
+            install_process.kill()
+            install_process.wait()
+            raise
+
+        stdout, stderr = install_process.communicate()
+        if install_process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                install_process.returncode,
+                install_process.args,
+                output=stdout,
+                stderr=stderr,
+            )
+        logging.info("Dependency installation: %s", stdout)
+
+        if use_eslint:
+            # ng lint fails outright until a lint builder is configured, so
+            # wire one up through the schematic first when it is missing
+            architect = projects.get(project_key, {}).get("architect", {})
+            if "lint" not in architect:
+                result = subprocess.run(
+                    ["ng", "add", "@angular-eslint/schematics", "--skip-confirmation"],
+                    cwd=project_dir,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    close_fds=False,
+                )
+                logging.info("ESLint schematic: %s", result.stdout)
+            write_text(eslint_file, dump_json(eslint_config_json))
+            logging.info("Created %s", eslint_file)
+            # Run ng lint setup
             result = subprocess.run(
-                [package_manager, "install", "--save-dev", "jest-preset-angular"],
+                ["ng", "lint", "--fix"],
                 cwd=project_dir,
                 check=True,
                 capture_output=True,
                 text=True,
+                close_fds=False,
             )
-            logging.info(f"Jest preset installation: {result.stdout}")
-
-        # Apply environment variables
-        if env_vars:
-            env_file = os.path.join(project_dir, ".env")
-            with open(env_file, "w") as f:
-                f.write(env_vars)
-            logging.info(f"Applied environment variables to {env_file}")
+            logging.info("ESLint setup: %s", result.stdout)
 
         return True, ""
     except subprocess.CalledProcessError as e:
@@ -358,3 +363,6 @@ def create_angular_project(
         error = f"Unexpected error: {str(e)}"
         logging.error(error)
         return False, error
+    finally:
+        if cleanup_thread is not None:
+            cleanup_thread.join()
@@ -2,51 +2,130 @@ import os
 import subprocess
 import logging
 import json
+import glob
+import shlex
 import shutil
-from dependencies import DependencyManager
+from collections import deque
+from dependencies import INSTALL_FLAGS, get_dependency_manager
+from utils.file_writer import dump_json, dump_json_bytes, write_files, write_text
+from utils.templates import STYLELINT_RC, TAILWIND_DIRECTIVES
 
+# Constant config files, serialized once at import time
+TAILWIND_CONFIG_JS = "module.exports = " + dump_json(
+    {
+        "content": ["./index.html", "./src/**/*.{vue,js,ts,jsx,tsx}"],
+        "theme": {"extend": {}},
+        "plugins": [],
+    }
+)
+VUE_CONFIG_JS = "module.exports = " + dump_json(
+    {
+        "css": {
+            "loaderOptions": {
+                "postcss": {
+                    "postcssOptions": {
+                        "plugins": [
+                            ["postcss-import", {}],
+                            ["@tailwindcss/postcss", {}],
+                            ["autoprefixer", {}],
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+LINT_SCRIPT = "eslint src/**/*.{js,ts,vue} --fix"
+MAIN_CSS_IMPORT = b"import './assets/main.css';\n"
 
-def create_vue_project(
-    project_path,
-    project_name,
-    use_typescript,
-    use_eslint,
-    eslint_config,
-    custom_eslint_rules,
-    use_tailwind,
-    use_prettier,
-    prettier_config,
-    auto_install,
-    use_router,
-    use_vuex,
-    package_manager,
-    use_stylelint,
-    env_vars,
-):
-    # Initialize DependencyManager
-    log_file = os.path.join(project_path, "logs", "scaffold.log")
-    dep_manager = DependencyManager(log_file)
 
-    # Ensure dependencies
-    success, error = dep_manager.ensure_dependencies()
-    if not success:
-        return False, error
+def _prepend_import(path, line):
+    """Prepend an import line to a source file unless its head already has it."""
+    try:
+        with open(path, "rb") as f:
+            # The import only ever lives at the top, so the first 64 bytes
+            # are enough to tell whether it is already there
+            head = f.read(64)
+            if line.rstrip(b";\n") in head:
+                return False
+            content = head + f.read()
+    except FileNotFoundError:
+        return False
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(line + content)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+def create_vue_project(cfg):
+    project_path = cfg.project_path
+    project_name = cfg.project_name
+    use_typescript = cfg.use_typescript
+    use_eslint = cfg.use_eslint
+    eslint_config = cfg.eslint_config
+    custom_eslint_rules = cfg.custom_eslint_rules
+    use_tailwind = cfg.use_tailwind
+    use_prettier = cfg.use_prettier
+    prettier_config = cfg.prettier_config
+    use_router = cfg.use_routing
+    use_vuex = cfg.use_vuex
+    package_manager = cfg.package_manager
+    use_stylelint = cfg.use_stylelint
+    env_vars = cfg.env_vars
+
+    # Reuse the session-wide DependencyManager and its cached checks
+    log_file = os.path.join(project_path, "logs", "scaffold.log")
+    dep_manager = get_dependency_manager(log_file)
 
     try:
         project_dir = os.path.join(project_path, project_name)
-        # Remove existing project directory to avoid conflicts
-        if os.path.exists(project_dir):
-            logging.info(f"Removing existing project directory: {project_dir}")
+        # Every path the scaffold touches, joined once up front
+        src_dir = os.path.join(project_dir, "src")
+        css_dir = os.path.join(src_dir, "assets")
+        css_file = os.path.join(css_dir, "main.css")
+        main_file = os.path.join(src_dir, "main.ts" if use_typescript else "main.js")
+        package_json_path = os.path.join(project_dir, "package.json")
+        eslint_file = os.path.join(project_dir, ".eslintrc.json")
+        prettier_file = os.path.join(project_dir, ".prettierrc")
+        tailwind_config_file = os.path.join(project_dir, "tailwind.config.js")
+        vue_config_file = os.path.join(project_dir, "vue.config.js")
+        stylelint_file = os.path.join(project_dir, ".stylelintrc.json")
+        env_file = os.path.join(project_dir, ".env")
+        # Ensure dependencies before touching an existing project directory,
+        # so a failed check or install leaves it in place. The results are
+        # cached for the session, so later scaffolds pay nothing here.
+        success, error = dep_manager.ensure_dependencies()
+        if not success:
+            return False, error
+
+        # Remove existing project directory to avoid conflicts. os.rmdir
+        # clears an empty directory in one syscall; only a populated tree
+        # (ENOTEMPTY) needs the recursive walk.
+        try:
+            os.rmdir(project_dir)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logging.info("Removing existing project directory: %s", project_dir)
             try:
                 shutil.rmtree(project_dir)
-                logging.info(f"Successfully removed {project_dir}")
+                logging.info("Successfully removed %s", project_dir)
             except Exception as e:
                 logging.error(
-                    f"Failed to remove existing directory {project_dir}: {str(e)}"
+                    "Failed to remove existing directory %s: %s", project_dir, e
                 )
                 return False, f"Failed to remove existing directory: {str(e)}"
         os.makedirs(project_dir, exist_ok=True)
-        logging.info(f"Created project directory: {project_dir}")
+        logging.info("Created project directory: %s", project_dir)
 
         # Construct vue create command
         cmd = [
@@ -64,62 +143,73 @@ def create_vue_project(
             cmd.append("--router")
         if use_vuex:
             cmd.append("--vuex")
-        logging.info(f"Running command: {' '.join(cmd)} in {project_path}")
-        result = subprocess.run(
-            cmd, cwd=project_path, check=True, capture_output=True, text=True
-        )
-        logging.info(f"Vue.js project created: {result.stdout}")
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("Running command: %s in %s", shlex.join(cmd), project_path)
+        # Stream vue create output into the log as it arrives instead of
+        # buffering it, keeping only the tail for the error message
+        output_tail = deque(maxlen=200)
+        with subprocess.Popen(
+            cmd,
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        ) as process:
+            for line in process.stdout:
+                logging.info(line.rstrip())
+                output_tail.append(line)
+            returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, cmd, output="".join(output_tail)
+            )
+        logging.info("Vue.js project created")
 
-        # Log project directory contents for debugging
-        dir_contents = os.listdir(project_dir)
-        logging.info(f"Project directory contents: {dir_contents}")
-        src_dir = os.path.join(project_dir, "src")
-        if os.path.exists(src_dir):
-            src_contents = os.listdir(src_dir)
-            logging.info(f"src directory contents: {src_contents}")
-        else:
+        try:
+            os.lstat(src_dir)
+        except FileNotFoundError:
             logging.error("src directory not found")
             return False, "Vue project creation failed: src directory not found"
+        # Log project directory contents for debugging; the scans are skipped
+        # entirely unless DEBUG logging is on
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Project directory contents: %s", os.listdir(project_dir))
+            logging.debug("src directory contents: %s", os.listdir(src_dir))
 
-        # Update package.json to add lint script
-        package_json_path = os.path.join(project_dir, "package.json")
-        with open(package_json_path, "r") as f:
-            package_json = json.load(f)
-        package_json["scripts"] = package_json.get("scripts", {})
-        package_json["scripts"]["lint"] = "eslint src/**/*.{js,ts,vue} --fix"
-        with open(package_json_path, "w") as f:
-            json.dump(package_json, f, indent=2)
-        logging.info(f"Updated {package_json_path} with lint script")
+        # Update package.json to add lint script, leaving the file alone when
+        # the CLI already generated the same one
+        with open(package_json_path, "rb") as f:
+            package_json = json.loads(f.read())
+        scripts = package_json.setdefault("scripts", {})
+        if scripts.get("lint") != LINT_SCRIPT:
+            scripts["lint"] = LINT_SCRIPT
+            write_text(package_json_path, dump_json_bytes(package_json))
+            logging.info("Updated %s with lint script", package_json_path)
+
+        # Dev dependencies for every selected feature are installed in a
+        # single package manager run once the config files are in place, and
+        # the independent config files are collected and written in one batch
+        dev_deps = []
+        config_writes = []
 
         if use_typescript:
-            logging.info("Installing TypeScript dependencies")
-            result = subprocess.run(
-                [package_manager, "install", "--save-dev", "typescript", "@types/node"],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"TypeScript installation: {result.stdout}")
+            dev_deps += ["typescript", "@types/node"]
 
         if use_eslint:
-            logging.info(f"Installing ESLint with config {eslint_config}")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "eslint",
-                    f"eslint-config-{eslint_config}",
-                    "eslint-plugin-vue",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"ESLint installation: {result.stdout}")
-            # Create .eslintrc.json
+            if not isinstance(custom_eslint_rules, dict):
+                logging.error(
+                    "Invalid ESLint configuration: custom rules must be an object"
+                )
+                return (
+                    False,
+                    "Invalid ESLint configuration: Custom ESLint rules must be a valid JSON object",
+                )
+            dev_deps += [
+                "eslint",
+                f"eslint-config-{eslint_config}",
+                "eslint-plugin-vue",
+            ]
             eslint_config_json = {
                 "env": {"browser": True, "es2021": True},
                 "extends": [
@@ -130,174 +220,98 @@ def create_vue_project(
                 "plugins": ["vue"],
                 "rules": custom_eslint_rules.get("rules", {}),
             }
-            eslint_file = os.path.join(project_dir, ".eslintrc.json")
-            with open(eslint_file, "w") as f:
-                json.dump(eslint_config_json, f, indent=2)
-            logging.info(f"Created {eslint_file} with ESLint configuration")
-            # Run eslint --fix to auto-correct linting issues
-            logging.info("Running ESLint auto-fix on src/ files")
-            try:
-                result = subprocess.run(
-                    ["npx", "eslint", "src/**/*.{js,ts,vue}", "--fix"],
-                    cwd=project_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                logging.info(f"ESLint auto-fix completed: {result.stdout}")
-            except subprocess.CalledProcessError as e:
-                logging.warning(
-                    f"ESLint auto-fix failed: {e.stderr or e.stdout or 'No additional error details'}"
-                )
-                # Continue despite ESLint fix failure, as it’s not critical
-            except Exception as e:
-                logging.warning(f"Unexpected error during ESLint auto-fix: {str(e)}")
+            config_writes.append((eslint_file, dump_json_bytes(eslint_config_json)))
 
         if use_tailwind:
-            logging.info("Installing Tailwind CSS with PostCSS plugins")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "tailwindcss",
-                    "@tailwindcss/postcss",
-                    "postcss",
-                    "autoprefixer",
-                    "postcss-import",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Tailwind/PostCSS installation: {result.stdout}")
-            # Manually create tailwind.config.js
-            tailwind_config = {
-                "content": ["./index.html", "./src/**/*.{vue,js,ts,jsx,tsx}"],
-                "theme": {"extend": {}},
-                "plugins": [],
-            }
-            tailwind_config_file = os.path.join(project_dir, "tailwind.config.js")
-            with open(tailwind_config_file, "w") as f:
-                f.write(f"module.exports = {json.dumps(tailwind_config, indent=2)}")
-            logging.info(f"Created {tailwind_config_file}")
+            dev_deps += [
+                "tailwindcss",
+                "@tailwindcss/postcss",
+                "postcss",
+                "autoprefixer",
+                "postcss-import",
+            ]
+            # Create tailwind.config.js
+            config_writes.append((tailwind_config_file, TAILWIND_CONFIG_JS))
             # Create vue.config.js for PostCSS integration
-            vue_config = {
-                "css": {
-                    "loaderOptions": {
-                        "postcss": {
-                            "postcssOptions": {
-                                "plugins": [
-                                    ["postcss-import", {}],
-                                    ["@tailwindcss/postcss", {}],
-                                    ["autoprefixer", {}],
-                                ]
-                            }
-                        }
-                    }
-                }
-            }
-            vue_config_file = os.path.join(project_dir, "vue.config.js")
-            with open(vue_config_file, "w") as f:
-                f.write(f"module.exports = {json.dumps(vue_config, indent=2)}")
-            logging.info(f"Created {vue_config_file}")
+            config_writes.append((vue_config_file, VUE_CONFIG_JS))
             # Update or create src/assets/main.css
-            css_file = os.path.join(project_dir, "src", "assets", "main.css")
-            tailwind_directives = """
-@tailwind base;
-@tailwind components;
-@tailwind utilities;
-"""
-            css_dir = os.path.dirname(css_file)
             os.makedirs(css_dir, exist_ok=True)
-            with open(css_file, "w") as f:
-                f.write(tailwind_directives)
-            logging.info(f"Created/Updated {css_file} with Tailwind directives")
+            config_writes.append((css_file, TAILWIND_DIRECTIVES))
             # Add import to main.js or main.ts
-            main_file = os.path.join(
-                project_dir, "src", "main.ts" if use_typescript else "main.js"
-            )
-            if os.path.exists(main_file):
-                with open(main_file, "r") as f:
-                    main_content = f.read()
-                if "import './assets/main.css'" not in main_content:
-                    main_content = "import './assets/main.css';\n" + main_content
-                    with open(main_file, "w") as f:
-                        f.write(main_content)
-                    logging.info(f"Added CSS import to {main_file}")
+            if _prepend_import(main_file, MAIN_CSS_IMPORT):
+                logging.info("Added CSS import to %s", main_file)
 
         if use_prettier:
-            logging.info("Installing Prettier")
-            result = subprocess.run(
-                [package_manager, "install", "--save-dev", "prettier"],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Prettier installation: {result.stdout}")
+            dev_deps.append("prettier")
 
         if use_stylelint:
-            logging.info("Installing Stylelint")
-            result = subprocess.run(
-                [
-                    package_manager,
-                    "install",
-                    "--save-dev",
-                    "stylelint",
-                    "stylelint-config-standard",
-                ],
-                cwd=project_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            logging.info(f"Stylelint installation: {result.stdout}")
-            stylelint_config = {
-                "extends": "stylelint-config-standard",
-                "rules": {"indentation": 2, "number-leading-zero": "always"},
-            }
-            stylelint_file = os.path.join(project_dir, ".stylelintrc.json")
-            with open(stylelint_file, "w") as f:
-                json.dump(stylelint_config, f, indent=2)
-            logging.info(f"Created {stylelint_file}")
-
-        # Apply custom ESLint rules
-        if use_eslint and custom_eslint_rules:
-            try:
-                if not isinstance(custom_eslint_rules, dict):
-                    raise ValueError("Custom ESLint rules must be a valid JSON object")
-                eslint_file = os.path.join(project_dir, ".eslintrc.json")
-                with open(eslint_file, "r") as f:
-                    eslint_config_json = json.load(f)
-                eslint_config_json["rules"].update(custom_eslint_rules.get("rules", {}))
-                with open(eslint_file, "w") as f:
-                    json.dump(eslint_config_json, f, indent=2)
-                logging.info(f"Applied custom ESLint rules to {eslint_file}")
-            except ValueError as e:
-                logging.error(f"Invalid ESLint configuration: {str(e)}")
-                return False, f"Invalid ESLint configuration: {str(e)}"
+            dev_deps += ["stylelint", "stylelint-config-standard"]
+            config_writes.append((stylelint_file, STYLELINT_RC))
 
         # Apply Prettier config
         if use_prettier and prettier_config:
             try:
                 if not isinstance(prettier_config, dict):
                     raise ValueError("Prettier config must be a valid JSON object")
-                prettier_file = os.path.join(project_dir, ".prettierrc")
-                with open(prettier_file, "w") as f:
-                    json.dump(prettier_config, f, indent=2)
-                logging.info(f"Applied Prettier config to {prettier_file}")
+                config_writes.append((prettier_file, dump_json_bytes(prettier_config)))
             except ValueError as e:
-                logging.error(f"Invalid Prettier configuration: {str(e)}")
+                logging.error("Invalid Prettier configuration: %s", e)
                 return False, f"Invalid Prettier configuration: {str(e)}"
 
         # Apply environment variables
         if env_vars:
-            env_file = os.path.join(project_dir, ".env")
-            with open(env_file, "w") as f:
-                f.write(env_vars)
-            logging.info(f"Applied environment variables to {env_file}")
+            config_writes.append((env_file, env_vars))
+
+        write_files(config_writes)
+
+        if dev_deps:
+            logging.info("Installing dev dependencies: %s", dev_deps)
+            # Only stderr is kept, for the error message if the install fails
+            subprocess.run(
+                [
+                    package_manager,
+                    "install",
+                    "--save-dev",
+                    *INSTALL_FLAGS.get(package_manager, []),
+                    *dev_deps,
+                ],
+                cwd=project_dir,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            logging.info("Dev dependency installation completed")
+
+        # Run eslint --fix to auto-correct linting issues, skipping the Node
+        # startup entirely when there is nothing to lint
+        lint_targets = []
+        if use_eslint:
+            for ext in ("js", "ts", "vue"):
+                lint_targets += glob.glob(
+                    os.path.join(src_dir, "**", f"*.{ext}"), recursive=True
+                )
+            if not lint_targets:
+                logging.info("No JS/TS/Vue files to lint; skipping ESLint auto-fix")
+        if lint_targets:
+            logging.info("Running ESLint auto-fix on src/ files")
+            try:
+                result = subprocess.run(
+                    ["npx", "eslint", *lint_targets, "--fix"],
+                    cwd=project_dir,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                logging.info("ESLint auto-fix completed: %s", result.stdout)
+            except subprocess.CalledProcessError as e:
+                logging.warning(
+                    "ESLint auto-fix failed: %s",
+                    e.stderr or e.stdout or "No additional error details",
+                )
+                # Continue despite ESLint fix failure, as it’s not critical
+            except Exception as e:
+                logging.warning("Unexpected error during ESLint auto-fix: %s", e)
 
         return True, ""
     except subprocess.CalledProcessError as e:
@@ -1,19 +1,44 @@
 import tkinter as tk
-from tkinter import filedialog
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import os
 import re
+import functools
 import logging
+import threading
 from scaffolder import ProjectScaffolder
+from utils.log_config import configure_logging
 import json
 
+_PROJECT_NAME_RE = re.compile(r"^[a-zA-Z0-9-]{1,50}$")
+_FRAMEWORKS = ("Vue.js", "Angular", "React")
+
+# Fixed pieces of the project preview tree
+_PREVIEW_HEAD_LINES = ("├── package.json",)
+_PREVIEW_GIT_LINES = ("├── .gitignore",)
+_PREVIEW_TAILWIND_LINES = ("├── tailwind.config.js", "├── postcss.config.js")
+_PREVIEW_TAIL_LINES = ("├── README.md", "├── .scaffold.json", "├── public/", "└── src/")
+_PREVIEW_VUE_LINES = ("    └── App.vue",)
+
+
+def _parse_json(text):
+    """Return (value, None) for valid JSON text, or (None, error) otherwise."""
+    try:
+        return json.loads(text), None
+    except json.JSONDecodeError as e:
+        return None, e
+
 
 class ProjectScaffolderApp:
+    # The theme is loaded once per process and shared by every app instance
+    _style = None
+
     def __init__(self, root):
         self.root = root
         self.root.title("Project Scaffolder")
-        self.style = ttk.Style("darkly")
+        if ProjectScaffolderApp._style is None:
+            ProjectScaffolderApp._style = ttk.Style("darkly")
+        self.style = ProjectScaffolderApp._style
         self.project_name = tk.StringVar()
         self.project_path = tk.StringVar()
         self.framework = tk.StringVar(value="Vue.js")
@@ -30,41 +55,71 @@ class ProjectScaffolderApp:
             value='{"printWidth": 80, "singleQuote": true, "trailingComma": "es5"}'
         )
         self.current_step = 1
+        self._preview_after_id = None
+        self._valid_project_path = None
 
-        # Live preview updates
-        self.framework.trace_add("write", lambda *args: self.update_preview())
-        self.use_typescript.trace_add("write", lambda *args: self.update_preview())
-        self.use_tailwind.trace_add("write", lambda *args: self.update_preview())
-        self.use_eslint.trace_add("write", lambda *args: self.update_preview())
-        self.use_prettier.trace_add("write", lambda *args: self.update_preview())
-        self.use_git.trace_add("write", lambda *args: self.update_preview())
-        self.project_name.trace_add("write", lambda *args: self.update_preview())
+        # Live preview updates, coalesced so a burst of edits repaints once.
+        # The traces keep a copy of each value the preview reads, so
+        # rendering doesn't have to call back into Tcl for them. They are
+        # only attached while step 3 (the one with the preview) is shown.
+        self._preview_vars = {
+            "project_name": self.project_name,
+            "framework": self.framework,
+            "use_git": self.use_git,
+            "use_tailwind": self.use_tailwind,
+        }
+        self._state = {name: var.get() for name, var in self._preview_vars.items()}
+        self._trace_ids = []
+
+        # The JSON configs are parsed once per edit rather than on every Create
+        self.custom_eslint_rules.trace_add("write", self._parse_eslint_rules)
+        self.prettier_config.trace_add("write", self._parse_prettier_config)
+        self._parse_eslint_rules()
+        self._parse_prettier_config()
 
         log_file = os.path.join(
             self.project_path.get() or os.getcwd(), "logs", "scaffold.log"
         )
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
+        configure_logging(log_file)
+
+        # Every step is built once up front; switching steps just raises
+        # the already-built frame
+        self.status_labels = {}
+        self.frames = {
+            1: self._build_step1(),
+            2: self._build_step2(),
+            3: self._build_step3(),
+        }
         self.setup_ui()
 
     def setup_ui(self):
-        self.clear_frame()
-        if self.current_step == 1:
-            self.setup_step1()
-        elif self.current_step == 2:
-            self.setup_step2()
-        elif self.current_step == 3:
-            self.setup_step3()
-
-    def clear_frame(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-    def setup_step1(self):
+        self.status_label = self.status_labels[self.current_step]
+        if self.current_step == 3:
+            self._attach_traces()
+        else:
+            self._detach_traces()
+        self.frames[self.current_step].tkraise()
+
+    def _attach_traces(self):
+        if self._trace_ids:
+            return
+        for name, var in self._preview_vars.items():
+            self._state[name] = var.get()
+            callback = functools.partial(self._on_var_change, name)
+            self._trace_ids.append((var, var.trace_add("write", callback)))
+        # Values may have changed while the traces were detached
+        self.update_preview()
+
+    def _detach_traces(self):
+        for var, trace_id in self._trace_ids:
+            var.trace_remove("write", trace_id)
+        self._trace_ids = []
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+            self._preview_after_id = None
+
+    def _build_step1(self):
         frame = ttk.Frame(self.root, padding="10")
         frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         ttk.Label(frame, text="Enter Project Name:").grid(
@@ -76,19 +131,20 @@ class ProjectScaffolderApp:
         ttk.Button(frame, text="Next", command=self.validate_step1).grid(
             row=2, column=0, pady=10
         )
-        self.status_label = ttk.Label(frame, text="")
-        self.status_label.grid(row=3, column=0, pady=5)
+        self.status_labels[1] = ttk.Label(frame, text="")
+        self.status_labels[1].grid(row=3, column=0, pady=5)
+        return frame
 
     def validate_step1(self):
         project_name = self.project_name.get().strip()
-        logging.info(f"Validating project name: {project_name}")
+        logging.info("Validating project name: %s", project_name)
         if not project_name:
             logging.error("Project name is empty")
             self.status_label.configure(
                 text="Error: Project name cannot be empty", bootstyle="danger"
             )
             return
-        if not re.match(r"^[a-zA-Z0-9-]{1,50}$", project_name):
+        if not _PROJECT_NAME_RE.match(project_name):
             logging.error("Invalid project name format")
             self.status_label.configure(
                 text="Error: Project name must be alphanumeric with hyphens, 1-50 characters",
@@ -102,7 +158,7 @@ class ProjectScaffolderApp:
         self.current_step = 2
         self.setup_ui()
 
-    def setup_step2(self):
+    def _build_step2(self):
         frame = ttk.Frame(self.root, padding="10")
         frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         ttk.Label(frame, text="Select Project Path:").grid(
@@ -120,21 +176,30 @@ class ProjectScaffolderApp:
         ttk.Button(frame, text="Next", command=self.validate_step2).grid(
             row=2, column=1, pady=10, sticky=tk.E
         )
-        self.status_label = ttk.Label(frame, text="")
-        self.status_label.grid(row=3, column=0, columnspan=2, pady=5)
+        self.status_labels[2] = ttk.Label(frame, text="")
+        self.status_labels[2].grid(row=3, column=0, columnspan=2, pady=5)
+        return frame
 
     def browse_path(self):
         logging.info("Opening directory chooser dialog")
+        # Only needed once the user actually browses
+        from tkinter import filedialog
+
         path = filedialog.askdirectory()
         if path:
             self.project_path.set(path)
-            logging.info(f"Selected project path: {path}")
+            logging.info("Selected project path: %s", path)
 
     def validate_step2(self):
         project_path = self.project_path.get().strip()
-        logging.info(f"Validating project path: {project_path}")
-        if not os.path.isdir(project_path):
-            logging.error(f"Invalid project path: {project_path}")
+        logging.info("Validating project path: %s", project_path)
+        # Only a successful check is remembered, so a directory created after
+        # a failed attempt is picked up on the next click
+        if project_path != self._valid_project_path:
+            if os.path.isdir(project_path):
+                self._valid_project_path = project_path
+        if project_path != self._valid_project_path:
+            logging.error("Invalid project path: %s", project_path)
             self.status_label.configure(
                 text="Error: Invalid project path", bootstyle="danger"
             )
@@ -146,54 +211,50 @@ class ProjectScaffolderApp:
         self.current_step = 3
         self.setup_ui()
 
-    def setup_step3(self):
+    def _build_step3(self):
         frame = ttk.Frame(self.root, padding="10")
         frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         ttk.Label(frame, text="Select Framework:").grid(
             row=0, column=0, pady=5, sticky=tk.W
         )
-        frameworks = ["Vue.js", "Angular", "React"]
-        ttk.OptionMenu(frame, self.framework, "Vue.js", *frameworks).grid(
+        ttk.OptionMenu(frame, self.framework, _FRAMEWORKS[0], *_FRAMEWORKS).grid(
             row=1, column=0, pady=5, sticky=tk.W
         )
-        ttk.Checkbutton(
-            frame, text="Use TypeScript", variable=self.use_typescript
-        ).grid(row=2, column=0, pady=5, sticky=tk.W)
-        ttk.Checkbutton(
-            frame, text="Use Tailwind CSS", variable=self.use_tailwind
-        ).grid(row=3, column=0, pady=5, sticky=tk.W)
-        ttk.Checkbutton(frame, text="Use ESLint", variable=self.use_eslint).grid(
-            row=4, column=0, pady=5, sticky=tk.W
-        )
-        ttk.Label(frame, text="ESLint Config (e.g., prettier, standard):").grid(
-            row=5, column=0, pady=5, sticky=tk.W
-        )
-        ttk.Entry(frame, textvariable=self.eslint_config).grid(
-            row=6, column=0, pady=5, sticky=(tk.W, tk.E)
-        )
-        ttk.Label(frame, text="Custom ESLint Rules (JSON):").grid(
-            row=7, column=0, pady=5, sticky=tk.W
-        )
-        ttk.Entry(frame, textvariable=self.custom_eslint_rules).grid(
-            row=8, column=0, pady=5, sticky=(tk.W, tk.E)
-        )
-        ttk.Label(frame, text="Custom Prettier Config (JSON):").grid(
-            row=9, column=0, pady=5, sticky=tk.W
-        )
-        ttk.Entry(frame, textvariable=self.prettier_config).grid(
-            row=10, column=0, pady=5, sticky=(tk.W, tk.E)
-        )
-        ttk.Checkbutton(frame, text="Use Prettier", variable=self.use_prettier).grid(
-            row=11, column=0, pady=5, sticky=tk.W
-        )
-        ttk.Checkbutton(
-            frame, text="Initialize Git repository", variable=self.use_git
-        ).grid(row=12, column=0, pady=5, sticky=tk.W)
+        # The option rows below the framework menu only differ in widget
+        # type and options, so they are laid out from one table
+        option_rows = [
+            (
+                ttk.Checkbutton,
+                {"text": "Use TypeScript", "variable": self.use_typescript},
+            ),
+            (
+                ttk.Checkbutton,
+                {"text": "Use Tailwind CSS", "variable": self.use_tailwind},
+            ),
+            (ttk.Checkbutton, {"text": "Use ESLint", "variable": self.use_eslint}),
+            (ttk.Label, {"text": "ESLint Config (e.g., prettier, standard):"}),
+            (ttk.Entry, {"textvariable": self.eslint_config}),
+            (ttk.Label, {"text": "Custom ESLint Rules (JSON):"}),
+            (ttk.Entry, {"textvariable": self.custom_eslint_rules}),
+            (ttk.Label, {"text": "Custom Prettier Config (JSON):"}),
+            (ttk.Entry, {"textvariable": self.prettier_config}),
+            (ttk.Checkbutton, {"text": "Use Prettier", "variable": self.use_prettier}),
+            (
+                ttk.Checkbutton,
+                {"text": "Initialize Git repository", "variable": self.use_git},
+            ),
+            (ttk.Label, {"text": "\U0001f4c1 Project Preview:"}),
+        ]
+        for row, (widget_cls, options) in enumerate(option_rows, start=2):
+            sticky = (tk.W, tk.E) if widget_cls is ttk.Entry else tk.W
+            widget_cls(frame, **options).grid(row=row, column=0, pady=5, sticky=sticky)
 
-        ttk.Label(frame, text="\U0001f4c1 Project Preview:").grid(
-            row=13, column=0, pady=5, sticky=tk.W
+        # The preview is read-only, so a Label is enough: one configure call
+        # per render instead of Text buffer edits
+        self.preview_text = ttk.Label(
+            frame, width=60, font=("Courier", 10), justify="left", anchor="nw"
         )
-        self.preview_text = tk.Text(frame, height=10, width=60, wrap="none")
+        self._preview_rendered = None
         self.preview_text.grid(
             row=14, column=0, columnspan=2, pady=5, sticky=(tk.W, tk.E)
         )
@@ -202,34 +263,58 @@ class ProjectScaffolderApp:
         ttk.Button(frame, text="Back", command=lambda: self.goto_step(2)).grid(
             row=15, column=0, pady=10, sticky=tk.W
         )
-        ttk.Button(frame, text="Create", command=self.create_project).grid(
-            row=15, column=1, pady=10, sticky=tk.E
+        self.create_button = ttk.Button(
+            frame, text="Create", command=self.create_project
         )
-        self.status_label = ttk.Label(frame, text="")
-        self.status_label.grid(row=16, column=0, columnspan=2, pady=5)
+        self.create_button.grid(row=15, column=1, pady=10, sticky=tk.E)
+        self.status_labels[3] = ttk.Label(frame, text="")
+        self.status_labels[3].grid(row=16, column=0, columnspan=2, pady=5)
+        return frame
+
+    def _parse_eslint_rules(self, *args):
+        self._parsed_eslint_rules = _parse_json(self.custom_eslint_rules.get())
+
+    def _parse_prettier_config(self, *args):
+        self._parsed_prettier_config = _parse_json(self.prettier_config.get())
+
+    def _on_var_change(self, name, *args):
+        self._state[name] = self._preview_vars[name].get()
+        self._schedule_preview()
+
+    def _schedule_preview(self, *args):
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(100, self.update_preview)
 
     def update_preview(self):
+        self._preview_after_id = None
         if not hasattr(self, "preview_text"):
             return  # Don't run if preview_text isn't built yet
 
-        project_name = self.project_name.get() or "my-project"
-        preview_lines = [f"{project_name}/"]
-
-        preview_lines.append("├── package.json")
-        if self.use_git.get():
-            preview_lines.append("├── .gitignore")
-        if self.use_tailwind.get():
-            preview_lines.append("├── tailwind.config.js")
-            preview_lines.append("├── postcss.config.js")
-        preview_lines.append("├── README.md")
-        preview_lines.append("├── .scaffold.json")
-        preview_lines.append("├── public/")
-        preview_lines.append("└── src/")
-        if self.framework.get() == "Vue.js":
-            preview_lines.append("    └── App.vue")
-
-        self.preview_text.delete("1.0", tk.END)
-        self.preview_text.insert("1.0", "\n".join(preview_lines))
+        state = self._state
+        preview = self._render_preview(
+            state["project_name"] or "my-project",
+            state["framework"],
+            state["use_git"],
+            state["use_tailwind"],
+        )
+        if preview != self._preview_rendered:
+            self.preview_text.configure(text=preview)
+            self._preview_rendered = preview
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _render_preview(project_name, framework, use_git, use_tailwind):
+        return "\n".join(
+            (
+                f"{project_name}/",
+                *_PREVIEW_HEAD_LINES,
+                *(_PREVIEW_GIT_LINES if use_git else ()),
+                *(_PREVIEW_TAILWIND_LINES if use_tailwind else ()),
+                *_PREVIEW_TAIL_LINES,
+                *(_PREVIEW_VUE_LINES if framework == "Vue.js" else ()),
+            )
+        )
 
     def goto_step(self, step):
         self.current_step = step
@@ -238,22 +323,18 @@ class ProjectScaffolderApp:
     def create_project(self):
         project_path = self.project_path.get().strip()
         project_name = self.project_name.get().strip()
-        logging.info(f"Creating project: {project_name} at {project_path}")
-        try:
-            custom_eslint_rules = (
-                json.loads(self.custom_eslint_rules.get())
-                if self.use_eslint.get()
-                else {}
-            )
-            prettier_config = (
-                json.loads(self.prettier_config.get())
-                if self.use_prettier.get()
-                else {}
-            )
-        except json.JSONDecodeError as e:
-            logging.error(f"Invalid JSON in ESLint or Prettier config: {str(e)}")
+        logging.info("Creating project: %s at %s", project_name, project_path)
+        custom_eslint_rules, eslint_error = (
+            self._parsed_eslint_rules if self.use_eslint.get() else ({}, None)
+        )
+        prettier_config, prettier_error = (
+            self._parsed_prettier_config if self.use_prettier.get() else ({}, None)
+        )
+        parse_error = eslint_error or prettier_error
+        if parse_error is not None:
+            logging.error("Invalid JSON in ESLint or Prettier config: %s", parse_error)
             self.status_label.configure(
-                text=f"Error: Invalid JSON in ESLint or Prettier config: {str(e)}",
+                text=f"Error: Invalid JSON in ESLint or Prettier config: {str(parse_error)}",
                 bootstyle="danger",
             )
             return
@@ -272,17 +353,34 @@ class ProjectScaffolderApp:
             "use_git": self.use_git.get(),
         }
 
-        scaffolder = ProjectScaffolder(project_path)
-        success, error = scaffolder.create_project(config)
+        # Scaffolding runs external tools for minutes at a time, so it runs on
+        # a worker thread and reports back on the Tk thread when done
+        self.create_button.configure(state="disabled")
+        self.status_label.configure(text="Creating project...", bootstyle="info")
+        threading.Thread(target=self._do_create, args=(config,), daemon=True).start()
+
+    def _do_create(self, config):
+        # Always report back, or the Create button would stay disabled
+        try:
+            scaffolder = ProjectScaffolder(config["project_path"])
+            success, error = scaffolder.create_project(config)
+        except Exception as e:
+            success, error = False, str(e)
+        self.root.after(0, self._on_create_done, config["project_name"], success, error)
+
+    def _on_create_done(self, project_name, success, error):
+        self.create_button.configure(state="normal")
+        # Report on step 3 even if the user has navigated away meanwhile
+        status_label = self.status_labels[3]
         if success:
-            self.status_label.configure(
+            status_label.configure(
                 text=f"Project '{project_name}' created successfully",
                 bootstyle="success",
             )
-            logging.info(f"Project '{project_name}' created successfully")
+            logging.info("Project '%s' created successfully", project_name)
         else:
-            self.status_label.configure(text=f"Error: {error}", bootstyle="danger")
-            logging.error(f"Project creation failed: {error}")
+            status_label.configure(text=f"Error: {error}", bootstyle="danger")
+            logging.error("Project creation failed: %s", error)
 
 
 if __name__ == "__main__":
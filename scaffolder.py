@@ -1,93 +1,71 @@
 import os
 import logging
-from frameworks.vue import create_vue_project
-from frameworks.angular import create_angular_project
-from frameworks.tailwind import install_tailwind
-from utils.git_manager import init_git_repo
-from utils.scaffold_tracker import write_scaffold_metadata
+from concurrent.futures import ThreadPoolExecutor
+from utils.log_config import configure_logging
+from utils.project_config import ScaffoldConfig
+
+# Logging only needs setting up by the first scaffolder of the session
+_LOGGING_READY = False
+
+_SUPPORTED_FRAMEWORKS = frozenset({"Vue.js", "Angular"})
 
 
 class ProjectScaffolder:
     def __init__(self, project_path):
         self.project_path = project_path
         self.log_file = os.path.join(project_path, "logs", "scaffold.log")
+        # Every project path gets its logs directory; logging itself is
+        # configured once per session
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-        logging.basicConfig(
-            filename=self.log_file,
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
+        global _LOGGING_READY
+        if not _LOGGING_READY:
+            configure_logging(self.log_file)
+            _LOGGING_READY = True
 
     def create_project(self, config):
         try:
-            project_name = config["project_name"]
-            project_path = config["project_path"]
-            framework = config.get("framework", "Vue.js")
-            full_project_path = os.path.join(project_path, project_name)
-            os.makedirs(full_project_path, exist_ok=True)
-            logging.info(f"Created project directory: {full_project_path}")
-
-            if framework == "Vue.js":
-                success, error = create_vue_project(
-                    project_path,
-                    project_name,
-                    config.get("use_typescript", False),
-                    config.get("use_eslint", False),
-                    config.get("eslint_config", "prettier"),
-                    config.get("custom_eslint_rules", {}),
-                    config.get("use_tailwind", False),
-                    config.get("use_prettier", False),
-                    config.get("prettier_config", {}),
-                    config.get("auto_install", False),
-                    config.get("use_standalone", False),
-                    config.get("use_tests", False),
-                    config.get("package_manager", "npm"),
-                    config.get("use_stylelint", False),
-                    config.get("env_vars", ""),
-                )
-                if not success:
-                    return False, error
-            elif framework == "Angular":
-                success, error = create_angular_project(
-                    project_path,
-                    project_name,
-                    config.get("use_typescript", False),
-                    config.get("use_eslint", False),
-                    config.get("eslint_config", "prettier"),
-                    config.get("custom_eslint_rules", {}),
-                    config.get("use_tailwind", False),
-                    config.get("use_prettier", False),
-                    config.get("prettier_config", {}),
-                    config.get("auto_install", False),
-                    config.get("use_standalone", False),
-                    config.get("use_tests", False),
-                    config.get("package_manager", "npm"),
-                    config.get("use_stylelint", False),
-                    config.get("env_vars", ""),
-                )
-                if not success:
-                    return False, error
-            else:
+            # Parse the config dict once; the framework steps read attributes
+            cfg = ScaffoldConfig.from_dict(config)
+            if cfg.framework not in _SUPPORTED_FRAMEWORKS:
                 logging.info(
-                    f"Framework {framework} not yet supported, created empty directory"
+                    "Framework %s not yet supported, nothing to create", cfg.framework
                 )
                 return True, ""
+            full_project_path = os.path.join(cfg.project_path, cfg.project_name)
+            os.makedirs(full_project_path, exist_ok=True)
+            logging.info("Created project directory: %s", full_project_path)
+
+            # Framework modules are imported on first use so that opening the
+            # UI doesn't pay for the ones that are never scaffolded
+            if cfg.framework == "Vue.js":
+                from frameworks.vue import create_vue_project
+
+                success, error = create_vue_project(cfg)
+            else:
+                from frameworks.angular import create_angular_project
 
-            # Optional manual Tailwind CSS install
-            if config.get("use_tailwind", False):
-                logging.info("Installing Tailwind CSS manually...")
-                install_tailwind(full_project_path)
+                success, error = create_angular_project(cfg)
+            if not success:
+                return False, error
 
-            # Optional Git initialization
-            if config.get("use_git", False):
-                logging.info("Initializing Git repository...")
-                init_git_repo(full_project_path)
+            from utils.git_manager import init_git_repo
+            from utils.scaffold_tracker import write_scaffold_metadata
 
-            # Write scaffold metadata
-            write_scaffold_metadata(full_project_path, config)
+            # Git initialization and the metadata write are independent, so
+            # they run side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                git_future = None
+                # Optional Git initialization
+                if cfg.use_git:
+                    logging.info("Initializing Git repository...")
+                    git_future = executor.submit(init_git_repo, full_project_path)
+                # Write scaffold metadata
+                executor.submit(write_scaffold_metadata, full_project_path, config)
+                if git_future is not None:
+                    git_future.result()
 
             return True, ""
 
         except Exception as e:
-            logging.error(f"Failed to create project: {str(e)}")
+            logging.error("Failed to create project: %s", e)
             return False, f"Failed to create project: {str(e)}"
@@ -0,0 +1,51 @@
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+
+
+def dump_json(obj):
+    """Serialize obj as 2-space indented JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+def dump_json_bytes(obj):
+    """Like dump_json, but returns UTF-8 bytes ready for write_text."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def write_text(path, data):
+    """Write a small file with raw os.open/os.write, skipping the buffered I/O layer."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def write_files(writes, max_workers=8):
+    """Write independent (path, data) pairs concurrently."""
+    writes = list(writes)
+    if not writes:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(writes))) as executor:
+        # list() re-raises the first write error in the caller
+        list(executor.map(lambda item: write_text(*item), writes))
+    for path, _ in writes:
+        logging.info("Created %s", path)
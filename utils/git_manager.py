@@ -2,7 +2,14 @@ import os
 import subprocess
 import logging
 
-GITIGNORE_TEMPLATES = {
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+_PYGIT2_ERRORS = (pygit2.GitError,) if pygit2 is not None else ()
+
+_GITIGNORE_SOURCES = {
     "node": """
 # Node.js
 node_modules/
@@ -38,38 +45,73 @@ logs/
 """,
 }
 
+# Stripped and encoded once, ready to be written as-is
+GITIGNORE_TEMPLATES = {
+    name: source.strip().encode("utf-8") for name, source in _GITIGNORE_SOURCES.items()
+}
+
 
 def detect_project_type(project_path):
     """Heuristic-based project type detection."""
-    if os.path.exists(os.path.join(project_path, "package.json")):
-        return "node"
-    elif os.path.exists(os.path.join(project_path, "requirements.txt")) or any(
-        f.endswith(".py") for f in os.listdir(project_path)
-    ):
-        return "python"
-    return "default"
+    # One directory pass; package.json wins over any Python marker, so only
+    # that can end the scan early
+    is_python = False
+    with os.scandir(project_path) as entries:
+        for entry in entries:
+            name = entry.name
+            if name == "package.json":
+                return "node"
+            if name == "requirements.txt" or name.endswith(".py"):
+                is_python = True
+    return "python" if is_python else "default"
+
+
+def _git_init(project_path):
+    """Run `git init` in project_path, via posix_spawn where the OS has it."""
+    # posix_spawn has no chdir file action, so git -C takes the place of cwd
+    cmd = ["git", "-C", project_path, "init"]
+    if not hasattr(os, "posix_spawnp"):
+        subprocess.run(cmd, check=True)
+        return
+    pid = os.posix_spawnp("git", cmd, os.environ)
+    _, status = os.waitpid(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
 
 
 def init_git_repo(project_path):
     try:
-        git_dir = os.path.join(project_path, ".git")
-        if os.path.exists(git_dir):
+        if os.path.exists(os.path.join(project_path, ".git")):
             logging.info("Git already initialized")
             return
 
-        subprocess.run(["git", "init"], cwd=project_path, check=True)
+        if pygit2 is not None:
+            # In-process libgit2 init, no git subprocess
+            pygit2.init_repository(project_path, bare=False)
+        else:
+            _git_init(project_path)
         logging.info("Initialized Git repository")
 
         gitignore_path = os.path.join(project_path, ".gitignore")
-        if not os.path.exists(gitignore_path):
+        # Exclusive create: an existing .gitignore is left untouched
+        try:
+            fd = os.open(gitignore_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        try:
             project_type = detect_project_type(project_path)
             content = GITIGNORE_TEMPLATES.get(
                 project_type, GITIGNORE_TEMPLATES["default"]
             )
-            with open(gitignore_path, "w") as f:
-                f.write(content.strip())
-            logging.info(f".gitignore created for {project_type} project")
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+        logging.info(".gitignore created for %s project", project_type)
 
     except subprocess.CalledProcessError as e:
-        logging.error(f"Git initialization failed: {e.stderr or e.stdout or str(e)}")
+        logging.error("Git initialization failed: %s", e.stderr or e.stdout or str(e))
+        raise RuntimeError("Git setup failed.")
+    except _PYGIT2_ERRORS as e:
+        logging.error("Git initialization failed: %s", e)
         raise RuntimeError("Git setup failed.")
@@ -0,0 +1,28 @@
+import atexit
+import logging
+from logging.handlers import MemoryHandler
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(log_file, capacity=64):
+    """Send root logging to log_file through a buffering MemoryHandler.
+
+    Records are written in batches of `capacity`, or straight away once an
+    ERROR comes in; whatever is left is flushed at exit. Like basicConfig,
+    this does nothing if the root logger already has handlers.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    memory_handler = MemoryHandler(
+        capacity,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
+    root.addHandler(memory_handler)
+    root.setLevel(logging.INFO)
+    atexit.register(memory_handler.close)
@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field, fields
+
+
+@dataclass(slots=True, frozen=True)
+class ScaffoldConfig:
+    """Scaffold options, parsed once from the UI's config dict."""
+
+    project_path: str
+    project_name: str
+    framework: str = "Vue.js"
+    use_typescript: bool = False
+    use_eslint: bool = False
+    eslint_config: str = "prettier"
+    custom_eslint_rules: dict = field(default_factory=dict)
+    use_tailwind: bool = False
+    use_prettier: bool = False
+    prettier_config: dict = field(default_factory=dict)
+    use_vuex: bool = False
+    use_routing: bool = False
+    use_tests: bool = False
+    package_manager: str = "npm"
+    use_stylelint: bool = False
+    env_vars: str = ""
+    use_git: bool = False
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build a config from a dict, ignoring keys it has no field for."""
+        return cls(**{name: config[name] for name in _FIELD_NAMES if name in config})
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(ScaffoldConfig))
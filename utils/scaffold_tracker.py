@@ -1,22 +1,24 @@
 import os
-import json
 import logging
 from datetime import datetime
+from utils.file_writer import dump_json_bytes, write_text
 
 
 def write_scaffold_metadata(project_dir, config):
     try:
-        # Add timestamp
-        config["created_at"] = datetime.now().isoformat()
+        metadata_path = os.path.join(project_dir, ".scaffold.json")
 
-        # Optional: Add tool version
-        config["scaffolder_version"] = "1.0.0"
+        # Add timestamp and tool version to a copy, leaving the caller's
+        # config untouched
+        metadata = {
+            **config,
+            "created_at": datetime.now().isoformat(),
+            "scaffolder_version": "1.0.0",
+        }
 
-        metadata_path = os.path.join(project_dir, ".scaffold.json")
-        with open(metadata_path, "w") as f:
-            json.dump(config, f, indent=4)
+        write_text(metadata_path, dump_json_bytes(metadata))
 
-        logging.info(f"Scaffold metadata written to {metadata_path}")
+        logging.info("Scaffold metadata written to %s", metadata_path)
 
     except Exception as e:
-        logging.error(f"Failed to write .scaffold.json: {str(e)}")
+        logging.error("Failed to write .scaffold.json: %s", e)
@@ -0,0 +1,14 @@
+from utils.file_writer import dump_json
+
+# Config file contents shared by the Vue and Angular scaffolds
+TAILWIND_DIRECTIVES = """
+@tailwind base;
+@tailwind components;
+@tailwind utilities;
+"""
+STYLELINT_RC = dump_json(
+    {
+        "extends": "stylelint-config-standard",
+        "rules": {"indentation": 2, "number-leading-zero": "always"},
+    }
+)